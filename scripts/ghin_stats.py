@@ -24,13 +24,25 @@ This script only processes the already-collected data file.
 """
 
 import json
+import re
 import sys
 import argparse
-import statistics
-from datetime import datetime
+import heapq
+from datetime import date, datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from collections import defaultdict, Counter
+from collections import defaultdict
+
+# Leading numeric portion of a GHIN score string (e.g. '82A' -> '82')
+_SCORE_RE = re.compile(r'(\d+(?:\.\d+)?)')
+
+# Display labels for handicap trend values in the text report
+_TREND_DISPLAY = {
+    "improving": "↗️  Improving",
+    "declining": "↘️  Declining",
+    "stable": "→ Stable",
+    "insufficient_data": "Insufficient data"
+}
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -74,9 +86,10 @@ def load_ghin_data(file_path: str) -> Dict[str, Any]:
     if not resolved.is_file():
         raise FileNotFoundError(f"GHIN data file not found: {file_path}")
 
+    # Parse the raw bytes directly; json detects UTF-8 itself, so no text
+    # decoding layer is needed in between
     try:
-        with open(resolved, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = json.loads(resolved.read_bytes())
     except json.JSONDecodeError:
         raise ValueError("File does not contain valid JSON")
 
@@ -104,26 +117,20 @@ def get_handicap_trend(handicap_history: List[Dict[str, Any]]) -> str:
     sorted_history = sorted(handicap_history, key=lambda x: x["date"])
     recent_5 = sorted_history[-5:]
     
-    indices = [entry["index"] for entry in recent_5]
-    
-    # Calculate trend using linear regression slope approximation
-    n = len(indices)
-    x_values = list(range(n))
-    x_mean = statistics.mean(x_values)
-    y_mean = statistics.mean(indices)
-    
-    numerator = sum((x_values[i] - x_mean) * (indices[i] - y_mean) for i in range(n))
-    denominator = sum((x_values[i] - x_mean) ** 2 for i in range(n))
-    
-    if denominator == 0:
-        return "stable"
+    i0, i1, _, i3, i4 = (entry["index"] for entry in recent_5)
     
-    slope = numerator / denominator
+    # Calculate trend using linear regression slope approximation. With x fixed
+    # at 0..4, x_mean is 2 and sum((x - x_mean)^2) is 10, so the least-squares
+    # slope is this weighted difference of the indices (i2 has weight 0) / 10.
+    # Rounding absorbs float noise from one-decimal indexes, so the threshold
+    # is exact: a slope of exactly +/-0.1 counts as stable.
+    slope_x10 = round(2 * (i4 - i0) + (i3 - i1), 6)
     
-    # Threshold for significant change (0.5 handicap points over 5 revisions)
-    if slope > 0.1:
+    # Threshold for significant change (slope beyond +/-0.1, i.e. 0.5 handicap
+    # points over 5 revisions)
+    if slope_x10 > 1.0:
         return "declining"  # Handicap going up (getting worse)
-    elif slope < -0.1:
+    elif slope_x10 < -1.0:
         return "improving"  # Handicap going down (getting better)
     else:
         return "stable"
@@ -142,8 +149,7 @@ def extract_numeric_score(score_str: str) -> Optional[float]:
         return None
     
     # Remove non-numeric characters except decimal point
-    import re
-    numeric_part = re.match(r'(\d+(?:\.\d+)?)', str(score_str))
+    numeric_part = _SCORE_RE.match(str(score_str))
     if numeric_part:
         try:
             return float(numeric_part.group(1))
@@ -162,79 +168,178 @@ def get_best_differentials(scores: List[Dict[str, Any]], count: int = 5) -> List
     Returns:
         List of best differential entries
     """
-    valid_scores = [score for score in scores if score.get("differential") is not None]
-    sorted_scores = sorted(valid_scores, key=lambda x: x["differential"])
-    return sorted_scores[:count]
+    valid_scores = (score for score in scores if score.get("differential") is not None)
+    return heapq.nsmallest(count, valid_scores, key=lambda x: x["differential"])
 
 
-def analyze_courses(scores: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Analyze performance by course.
+def _parse_year(date_str: str) -> Optional[str]:
+    """Extract the year from a GHIN date string (YYYY-MM-DD).
+    
+    Args:
+        date_str: Date string from GHIN data
+    
+    Returns:
+        Four-digit year string or None if the date cannot be parsed
+    """
+    # Canonical YYYY-MM-DD dates are checked with a slice and date() instead
+    # of strptime; anything else still goes through strptime so the set of
+    # accepted dates is unchanged
+    if (len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-"
+            and date_str.isascii() and date_str[:4].isdigit()
+            and date_str[5:7].isdigit() and date_str[8:].isdigit()):
+        year = int(date_str[:4])
+        try:
+            date(year, int(date_str[5:7]), int(date_str[8:]))
+        except ValueError:
+            return None
+        return str(year)
+    
+    try:
+        return str(datetime.strptime(date_str, "%Y-%m-%d").year)
+    except ValueError:
+        return None
+
+
+def _new_group_stats() -> Dict[str, Dict[str, Any]]:
+    """Create an empty per-group accumulator for course or year stats.
+    
+    Returns:
+        Dictionary that maps a group key to its round count and running
+        score sum/count, creating missing groups on first access
+    """
+    return defaultdict(lambda: {"rounds": 0, "score_sum": 0.0, "score_count": 0})
+
+
+def _add_to_group(group_stats: Dict[str, Dict[str, Any]], key: str, numeric_score: Optional[float]) -> None:
+    """Record one round against a course or year group.
+    
+    Args:
+        group_stats: Accumulator created by _new_group_stats
+        key: Course name or year to record the round under
+        numeric_score: Parsed score for the round, or None if unparseable
+    """
+    group = group_stats[key]
+    group["rounds"] += 1
+    if numeric_score is not None:
+        group["score_sum"] += numeric_score
+        group["score_count"] += 1
+
+
+def _aggregate_scores(
+    scores: List[Dict[str, Any]]
+) -> Tuple[Optional[float], Optional[float], Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Walk the score history once, collecting extremes and per-course/per-year groups.
+    
+    Each entry's score and date are parsed a single time and reused for every
+    aggregation, rather than re-parsed by separate passes.
     
     Args:
         scores: List of score entries
         
     Returns:
-        List of course statistics sorted by play frequency
+        Tuple of (low_score, high_score, course_stats, yearly_stats) where the
+        stats dictionaries map a group key to its round count and running
+        score sum/count
     """
-    course_stats = defaultdict(lambda: {"rounds": 0, "scores": []})
+    valid_scores = []
+    course_stats = _new_group_stats()
+    yearly_stats = _new_group_stats()
     
     for score_entry in scores:
-        course = score_entry.get("course", "Unknown Course")
         numeric_score = extract_numeric_score(score_entry.get("score", ""))
-        
-        course_stats[course]["rounds"] += 1
         if numeric_score is not None:
-            course_stats[course]["scores"].append(numeric_score)
+            valid_scores.append(numeric_score)
+        
+        _add_to_group(course_stats, score_entry.get("course", "Unknown Course"), numeric_score)
+        
+        year = _parse_year(score_entry.get("date", ""))
+        if year is not None:
+            _add_to_group(yearly_stats, year, numeric_score)
     
-    # Convert to list with averages
+    # Builtin min/max scan the collected floats in C rather than comparing per entry
+    low_score = min(valid_scores) if valid_scores else None
+    high_score = max(valid_scores) if valid_scores else None
+    
+    return low_score, high_score, course_stats, yearly_stats
+
+
+def _summarize_courses(course_stats: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert aggregated course groups to a list with averages.
+    
+    Args:
+        course_stats: Course accumulator built by _add_to_group
+    
+    Returns:
+        List of course statistics sorted by play frequency
+    """
     result = []
     for course, stats in course_stats.items():
-        avg_score = statistics.mean(stats["scores"]) if stats["scores"] else None
+        avg_score = stats["score_sum"] / stats["score_count"] if stats["score_count"] else None
         result.append({
             "course": course,
             "rounds": stats["rounds"],
-            "avg_score": round(avg_score, 1) if avg_score else None
+            "avg_score": round(avg_score, 1) if avg_score is not None else None
         })
     
     return sorted(result, key=lambda x: x["rounds"], reverse=True)
 
 
-def analyze_by_year(scores: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-    """Analyze performance by year.
+def _summarize_years(yearly_stats: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Convert aggregated year groups to a dictionary with averages.
     
     Args:
-        scores: List of score entries
+        yearly_stats: Year accumulator built by _add_to_group
         
     Returns:
         Dictionary with year as key and stats as values
     """
-    yearly_stats = defaultdict(lambda: {"rounds": 0, "scores": []})
-    
-    for score_entry in scores:
-        date_str = score_entry.get("date", "")
-        try:
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            year = str(date_obj.year)
-        except ValueError:
-            continue
-        
-        numeric_score = extract_numeric_score(score_entry.get("score", ""))
-        yearly_stats[year]["rounds"] += 1
-        if numeric_score is not None:
-            yearly_stats[year]["scores"].append(numeric_score)
-    
-    # Calculate averages
     result = {}
     for year, stats in yearly_stats.items():
-        avg_score = statistics.mean(stats["scores"]) if stats["scores"] else None
+        avg_score = stats["score_sum"] / stats["score_count"] if stats["score_count"] else None
         result[year] = {
             "rounds": stats["rounds"],
-            "avg_score": round(avg_score, 1) if avg_score else None
+            "avg_score": round(avg_score, 1) if avg_score is not None else None
         }
     
     return result
 
 
+def analyze_courses(scores: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Analyze performance by course.
+    
+    Args:
+        scores: List of score entries
+    
+    Returns:
+        List of course statistics sorted by play frequency
+    """
+    course_stats = _new_group_stats()
+    for score_entry in scores:
+        numeric_score = extract_numeric_score(score_entry.get("score", ""))
+        _add_to_group(course_stats, score_entry.get("course", "Unknown Course"), numeric_score)
+    
+    return _summarize_courses(course_stats)
+
+
+def analyze_by_year(scores: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Analyze performance by year.
+    
+    Args:
+        scores: List of score entries
+    
+    Returns:
+        Dictionary with year as key and stats as values
+    """
+    yearly_stats = _new_group_stats()
+    for score_entry in scores:
+        year = _parse_year(score_entry.get("date", ""))
+        if year is None:
+            continue
+        _add_to_group(yearly_stats, year, extract_numeric_score(score_entry.get("score", "")))
+    
+    return _summarize_years(yearly_stats)
+
+
 def get_handicap_extremes(handicap_history: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
     """Get handicap high and low with dates.
     
@@ -247,9 +352,14 @@ def get_handicap_extremes(handicap_history: List[Dict[str, Any]]) -> Tuple[Optio
     if not handicap_history:
         return None, None
     
-    sorted_by_index = sorted(handicap_history, key=lambda x: x["index"])
-    lowest = sorted_by_index[0] if sorted_by_index else None
-    highest = sorted_by_index[-1] if sorted_by_index else None
+    # Single linear scan; ties resolve to the first low and the last high,
+    # matching the order a stable sort by index would give
+    lowest = highest = handicap_history[0]
+    for entry in handicap_history:
+        if entry["index"] < lowest["index"]:
+            lowest = entry
+        if entry["index"] >= highest["index"]:
+            highest = entry
     
     return lowest, highest
 
@@ -274,20 +384,19 @@ def compute_statistics(data: Dict[str, Any]) -> Dict[str, Any]:
     stats["lifetime_rounds"] = data.get("lifetime_rounds", 0)
     
     scores = data.get("scores", [])
-    numeric_scores = [extract_numeric_score(score.get("score", "")) for score in scores]
-    valid_scores = [s for s in numeric_scores if s is not None]
+    low_score, high_score, course_stats, yearly_stats = _aggregate_scores(scores)
     
-    stats["low_score"] = min(valid_scores) if valid_scores else None
-    stats["high_score"] = max(valid_scores) if valid_scores else None
+    stats["low_score"] = low_score
+    stats["high_score"] = high_score
     
     # Best differentials
     stats["best_differentials"] = get_best_differentials(scores)
     
     # Course analysis
-    stats["courses"] = analyze_courses(scores)
+    stats["courses"] = _summarize_courses(course_stats)
     
     # Yearly breakdown
-    stats["yearly_breakdown"] = analyze_by_year(scores)
+    stats["yearly_breakdown"] = _summarize_years(yearly_stats)
     
     # Performance stats from data
     ghin_stats = data.get("stats", {})
@@ -327,12 +436,7 @@ def format_text_output(stats: Dict[str, Any]) -> str:
     current_hcp = stats.get("current_handicap")
     if current_hcp is not None:
         trend = stats.get("handicap_trend", "unknown")
-        trend_display = {
-            "improving": "↗️  Improving",
-            "declining": "↘️  Declining", 
-            "stable": "→ Stable",
-            "insufficient_data": "Insufficient data"
-        }.get(trend, trend)
+        trend_display = _TREND_DISPLAY.get(trend, trend)
         
         lines.append(f"Current Handicap: {current_hcp}")
         lines.append(f"Trend (last 5): {trend_display}")
@@ -342,21 +446,23 @@ def format_text_output(stats: Dict[str, Any]) -> str:
     lines.append("LIFETIME TOTALS")
     lines.append("-" * 15)
     lines.append(f"Total Rounds: {stats.get('lifetime_rounds', 0)}")
-    if stats.get("low_score"):
-        lines.append(f"Best Score: {stats['low_score']}")
-    if stats.get("high_score"):
-        lines.append(f"Worst Score: {stats['high_score']}")
+    low_score = stats.get("low_score")
+    high_score = stats.get("high_score")
+    if low_score is not None:
+        lines.append(f"Best Score: {low_score}")
+    if high_score is not None:
+        lines.append(f"Worst Score: {high_score}")
     lines.append("")
     
     # Handicap extremes
-    if stats.get("handicap_low") or stats.get("handicap_high"):
+    hcp_low = stats.get("handicap_low")
+    hcp_high = stats.get("handicap_high")
+    if hcp_low is not None or hcp_high is not None:
         lines.append("HANDICAP RANGE")
         lines.append("-" * 14)
-        if stats.get("handicap_low"):
-            hcp_low = stats["handicap_low"]
+        if hcp_low is not None:
             lines.append(f"Lowest: {hcp_low['index']} ({hcp_low['date']})")
-        if stats.get("handicap_high"):
-            hcp_high = stats["handicap_high"]
+        if hcp_high is not None:
             lines.append(f"Highest: {hcp_high['index']} ({hcp_high['date']})")
         lines.append("")
     
@@ -381,7 +487,7 @@ def format_text_output(stats: Dict[str, Any]) -> str:
             name = course["course"]
             rounds = course["rounds"]
             avg = course["avg_score"]
-            avg_str = f"avg {avg:.1f}" if avg else "no avg"
+            avg_str = f"avg {avg:.1f}" if avg is not None else "no avg"
             lines.append(f"{name}: {rounds} rounds ({avg_str})")
         lines.append("")
     
@@ -390,18 +496,24 @@ def format_text_output(stats: Dict[str, Any]) -> str:
     if any(v is not None for v in performance.values()):
         lines.append("PERFORMANCE AVERAGES")
         lines.append("-" * 20)
-        if performance.get("par3_avg"):
-            lines.append(f"Par 3 Average: {performance['par3_avg']:.2f}")
-        if performance.get("par4_avg"):
-            lines.append(f"Par 4 Average: {performance['par4_avg']:.2f}")
-        if performance.get("par5_avg"):
-            lines.append(f"Par 5 Average: {performance['par5_avg']:.2f}")
-        if performance.get("gir_pct"):
-            lines.append(f"Greens in Regulation: {performance['gir_pct']:.1f}%")
-        if performance.get("fairways_pct"):
-            lines.append(f"Fairways Hit: {performance['fairways_pct']:.1f}%")
-        if performance.get("putts_avg"):
-            lines.append(f"Average Putts: {performance['putts_avg']:.1f}")
+        par3_avg = performance.get("par3_avg")
+        par4_avg = performance.get("par4_avg")
+        par5_avg = performance.get("par5_avg")
+        gir_pct = performance.get("gir_pct")
+        fairways_pct = performance.get("fairways_pct")
+        putts_avg = performance.get("putts_avg")
+        if par3_avg is not None:
+            lines.append(f"Par 3 Average: {par3_avg:.2f}")
+        if par4_avg is not None:
+            lines.append(f"Par 4 Average: {par4_avg:.2f}")
+        if par5_avg is not None:
+            lines.append(f"Par 5 Average: {par5_avg:.2f}")
+        if gir_pct is not None:
+            lines.append(f"Greens in Regulation: {gir_pct:.1f}%")
+        if fairways_pct is not None:
+            lines.append(f"Fairways Hit: {fairways_pct:.1f}%")
+        if putts_avg is not None:
+            lines.append(f"Average Putts: {putts_avg:.1f}")
         lines.append("")
     
     # Yearly breakdown
@@ -413,7 +525,7 @@ def format_text_output(stats: Dict[str, Any]) -> str:
             year_stats = yearly[year]
             rounds = year_stats["rounds"]
             avg = year_stats["avg_score"]
-            avg_str = f"avg {avg:.1f}" if avg else "no avg"
+            avg_str = f"avg {avg:.1f}" if avg is not None else "no avg"
             lines.append(f"{year}: {rounds} rounds ({avg_str})")
     
     return "\n".join(lines)
@@ -444,9 +556,18 @@ def main() -> None:
         
         # Output results
         if args.format == "json":
-            print(format_json_output(stats))
+            output = format_json_output(stats)
+        else:
+            output = format_text_output(stats)
+        
+        # Write the whole report as UTF-8 in one call, bypassing the text layer.
+        # Replaced streams (e.g. StringIO when output is captured) have no buffer.
+        buffer = getattr(sys.stdout, "buffer", None)
+        if buffer is None:
+            sys.stdout.write(output + "\n")
         else:
-            print(format_text_output(stats))
+            buffer.write((output + "\n").encode("utf-8"))
+            buffer.flush()
             
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)